@@ -0,0 +1,99 @@
+"""SQLite cache backend used by github_pr for cached API responses."""
+import sqlite3
+import time
+from datetime import timezone
+
+from aiohttp_client_cache.backends import CacheBackend
+from aiohttp_client_cache.backends.sqlite import SQLiteCache, SQLitePickleCache
+
+
+class ExpiringSQLiteCache(SQLitePickleCache):
+    """SQLite response table with an indexed ``expires_at`` column.
+
+    Expired rows are purged with a single indexed ``DELETE`` when the
+    database is first opened, instead of one key at a time on access.
+    Redirect rows pointing at a purged key are left behind; they just
+    resolve to a cache miss.
+    """
+
+    async def _init_db(self):
+        db = self._connection
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.execute("PRAGMA mmap_size=268435456")
+        await super()._init_db()
+
+        cursor = await db.execute(f"PRAGMA table_info(`{self.table_name}`)")
+        columns = [row[1] for row in await cursor.fetchall()]
+        if "expires_at" not in columns:
+            await db.execute(
+                f"ALTER TABLE `{self.table_name}` ADD COLUMN expires_at INTEGER"
+            )
+        await db.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_expires ON `{self.table_name}` (expires_at)"
+        )
+        await db.execute(
+            f"DELETE FROM `{self.table_name}` WHERE expires_at < ?",
+            (int(time.time()),),
+        )
+        await db.commit()
+
+    async def expired_keys(self) -> set:
+        """Return the keys of expired rows, found through the expires_at index."""
+        async with self.get_connection() as db:
+            cursor = await db.execute(
+                f"SELECT key FROM `{self.table_name}` WHERE expires_at < ?",
+                (int(time.time()),),
+            )
+            return {row[0] for row in await cursor.fetchall()}
+
+    async def write(self, key, item):
+        # CachedResponse.expires is a naive UTC datetime (or None for "never")
+        expires = getattr(item, "expires", None)
+        expires_at = (
+            int(expires.replace(tzinfo=timezone.utc).timestamp()) if expires else None
+        )
+        async with self.get_connection(commit=True) as db:
+            await db.execute(
+                f"INSERT OR REPLACE INTO `{self.table_name}` (key,value,expires_at) "
+                "VALUES (?,?,?)",
+                (key, sqlite3.Binary(self.serialize(item)), expires_at),
+            )
+
+
+class ExpiringSQLiteBackend(CacheBackend):
+    """SQLite cache backend that stores responses in an ExpiringSQLiteCache.
+
+    Mirrors ``SQLiteBackend`` but builds the response table directly, so no
+    plain ``SQLitePickleCache`` or connection is created just to be replaced.
+    """
+
+    def __init__(
+        self,
+        cache_name: str = "github_cache",
+        use_temp: bool = False,
+        fast_save: bool = False,
+        autoclose: bool = True,
+        **kwargs,
+    ):
+        super().__init__(cache_name=cache_name, autoclose=autoclose, **kwargs)
+        self._has_filter = "filter_fn" in kwargs
+        self.responses = ExpiringSQLiteCache(
+            cache_name, "responses", use_temp=use_temp, fast_save=fast_save, **kwargs
+        )
+        self.redirects = SQLiteCache(
+            cache_name,
+            "redirects",
+            use_temp=use_temp,
+            connection=self.responses._connection,
+            lock=self.responses._lock,
+            **kwargs,
+        )
+
+    async def delete_expired_responses(self):
+        # delete() also drops the redirect rows of each expired response
+        await self.bulk_delete(await self.responses.expired_keys())
+        # filter_fn can only be checked against each stored response, so
+        # fall back to the base class's full scan when one is set
+        if self._has_filter:
+            await super().delete_expired_responses()
@@ -1,27 +1,57 @@
 #!/usr/bin/env python3
+import asyncio
+import math
 import os
 import sys
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional
 import re
-from datetime import datetime
-import aiohttp
-import aiohttp_client_cache
-from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
-from rich.columns import Columns
-from rich.text import Text
-from rich.box import ROUNDED
+import functools
+from datetime import date
 import argparse
-from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    import json
+
+    json_loads = json.loads
+
+    def json_dumps(data) -> bytes:
+        return json.dumps(data, ensure_ascii=False).encode()
 
 # Constants
 DEFAULT_API_URL = "https://api.github.com"
 REPO_PATTERN = r"^[A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+$"
+_REPO_RE = re.compile(REPO_PATTERN)
+LINK_LAST_PATTERN = r'<[^>]*[?&]page=(\d+)>; rel="last"'
+_LINK_LAST_RE = re.compile(LINK_LAST_PATTERN)
+PER_PAGE = 100
+MAX_CONCURRENT_PAGES = 8
+MAX_CONCURRENT_REPOS = 4
+MAX_RETRIES = 3
+MAX_RATE_LIMIT_WAIT = 60  # seconds
+# GitHub timestamps are always YYYY-MM-DDTHH:MM:SSZ, so the date is a fixed slice
+ISO_DATE_LEN = 10  # len("YYYY-MM-DD")
+CACHE_BACKENDS = ("memory", "sqlite", "none")
+DEFAULT_CACHE_BACKEND = "memory"
+
+# Shared HTTP session, created on first use by get_session()
+session: Optional["ClientSession"] = None
+
+# rich, aiohttp and dotenv are imported where they are used, so that
+# --help and input validation errors don't pay for loading them.
+
+
+@functools.lru_cache(maxsize=None)
+def _console():
+    """Return the shared rich console, importing rich on first use."""
+    from rich.console import Console
 
-# Initialize console
-console = Console()
+    return Console()
 
 
 
@@ -29,40 +59,139 @@ def validate_token() -> str:
     """Validate GitHub token from environment variables."""
     token = os.getenv("GITHUB_TOKEN")
     if not token:
-        console.print("[red]Error: GITHUB_TOKEN environment variable not set[/red]")
-        console.print("Please set your GitHub Personal Access Token:")
-        console.print("export GITHUB_TOKEN='your-token-here'")
+        _console().print("[red]Error: GITHUB_TOKEN environment variable not set[/red]")
+        _console().print("Please set your GitHub Personal Access Token:")
+        _console().print("export GITHUB_TOKEN='your-token-here'")
         sys.exit(1)
     return token
 
 
 def validate_repository(repository: str) -> bool:
     """Validate repository format (owner/repo)."""
-    if not re.match(REPO_PATTERN, repository):
-        console.print("[red]Error: Invalid repository format[/red]")
-        console.print("Format should be: owner/repository")
+    if not _REPO_RE.match(repository):
+        from rich.markup import escape
+
+        _console().print(
+            f"[red]Error: Invalid repository format: {escape(repository)}[/red]"
+        )
+        _console().print("Format should be: owner/repository")
         return False
     return True
 
 
 def validate_date(date_str: str) -> bool:
     """Validate date string format (YYYY-MM-DD)."""
+    # The format is fixed-width, so check the shape directly and let
+    # date.fromisoformat validate the calendar values; both are much
+    # cheaper than strptime.
+    if len(date_str) != 10 or date_str[4] != "-" or date_str[7] != "-":
+        return False
     try:
-        datetime.strptime(date_str, "%Y-%m-%d")
+        date.fromisoformat(date_str)
         return True
     except ValueError:
         return False
 
 
-async def create_session():
-    """Create and return a cached aiohttp session."""
+def parse_last_page(link_header: Optional[str]) -> int:
+    """Return the last page number advertised by a GitHub ``Link`` header."""
+    if link_header:
+        match = _LINK_LAST_RE.search(link_header)
+        if match:
+            return int(match.group(1))
+    return 1
+
+
+def retry_delay(status: int, headers, attempt: int) -> Optional[float]:
+    """Return how long to wait before retrying a response, or None to give up.
+
+    Server errors are retried with exponential backoff. A 403 caused by an
+    exhausted rate limit waits until the reset time GitHub reports, as long
+    as that is within MAX_RATE_LIMIT_WAIT.
+    """
+    if attempt >= MAX_RETRIES:
+        return None
+    if status >= 500:
+        return 2 ** attempt
+    if status == 403 and headers.get("X-RateLimit-Remaining") == "0":
+        reset = headers.get("X-RateLimit-Reset")
+        if reset and reset.isdigit():
+            wait = max(0, int(reset) - time.time())
+            if wait <= MAX_RATE_LIMIT_WAIT:
+                return wait
+    return None
+
+
+def slim_pull(pr: dict) -> dict:
+    """Keep only the pull request fields used for display and export."""
+    return {
+        "number": pr["number"],
+        "title": pr["title"],
+        "user": {"login": pr["user"]["login"]},
+        "state": pr["state"],
+        "created_at": pr["created_at"],
+        "updated_at": pr["updated_at"],
+    }
+
+
+async def create_session(cache_backend: str = DEFAULT_CACHE_BACKEND):
+    """Create and return an aiohttp session using the given cache backend.
+
+    ``memory`` keeps responses for the life of the process, ``sqlite``
+    persists them to ``github_cache.sqlite`` between runs and ``none``
+    returns a plain, uncached session.
+    """
+    import aiohttp
+    import aiohttp_client_cache
+
+    # aiohttp speaks HTTP/1.1 only, so every in-flight page needs its own
+    # connection; keep one alive per concurrent page fetch so a request
+    # never waits for a free connection in the pool.
+    connector = aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=MAX_CONCURRENT_REPOS * MAX_CONCURRENT_PAGES,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+    )
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if cache_backend == "none":
+        return aiohttp.ClientSession(connector=connector, headers=headers)
+
+    # Every request is revalidated with If-None-Match (see fetch_page), so
+    # expire_after only bounds how long a stored ETag is kept around.
+    cache_options = {
+        "cache_name": "github_cache",
+        "expire_after": 86400,  # 1 day
+        "allowed_methods": ("GET",),
+    }
+    if cache_backend == "sqlite":
+        from github_cache import ExpiringSQLiteBackend
+
+        cache = ExpiringSQLiteBackend(**cache_options)
+    else:
+        cache = aiohttp_client_cache.CacheBackend(**cache_options)
     return aiohttp_client_cache.CachedSession(
-        cache_name="github_cache",
-        backend="sqlite",
-        expire_after=300,  # 5 minutes
-        allowable_methods=("GET",)
+        cache=cache,
+        connector=connector,
+        headers=headers,
     )
 
+
+async def get_session(cache_backend: str = DEFAULT_CACHE_BACKEND):
+    """Return the shared session, creating it with ``cache_backend`` on first use."""
+    global session
+    if session is None:
+        session = await create_session(cache_backend)
+    return session
+
+
+async def close_session() -> None:
+    """Close the shared session, if one was created."""
+    global session
+    if session is not None:
+        await session.close()
+        session = None
+
 async def fetch_pull_requests(
     repository: str,
     status: str,
@@ -70,6 +199,7 @@ async def fetch_pull_requests(
     limit: Optional[int] = None,
     created_after: Optional[str] = None,
     created_before: Optional[str] = None,
+    show_progress: bool = True,
 ) -> list:
     """Fetch pull requests from GitHub API with pagination support.
 
@@ -80,6 +210,8 @@ async def fetch_pull_requests(
         limit: Maximum number of PRs to return
         created_after: Only include PRs created after this date (YYYY-MM-DD)
         created_before: Only include PRs created before this date (YYYY-MM-DD)
+        show_progress: Show a spinner while fetching; rich allows only one
+            live display at a time, so concurrent callers turn this off
     """
     if created_after and not validate_date(created_after):
         raise ValueError("created_after must be in YYYY-MM-DD format")
@@ -87,74 +219,161 @@ async def fetch_pull_requests(
         raise ValueError("created_before must be in YYYY-MM-DD format")
 
     api_url = os.getenv("GITHUB_API_URL", DEFAULT_API_URL)
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-
-    session = await create_session()
-    pulls = []
-    page = 1
-
-    try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=True,
-        ) as progress:
-            progress.add_task(description="Fetching pull requests...", total=None)
-
-        while True:
-            url = f"{api_url}/repos/{repository}/pulls"
-            params = {"state": status, "page": page, "per_page": 100}
-            if created_after:
-                params["created"] = f">={created_after}"
-            if created_before:
-                params["created"] = f"<={created_before}"
-            if created_after and created_before:
-                params["created"] = f"{created_after}..{created_before}"
+    headers = {"Authorization": f"token {token}"}
+
+    import aiohttp
+    import aiohttp_client_cache
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    url = f"{api_url}/repos/{repository}/pulls"
+    # Don't download more rows than the limit asks for
+    per_page = min(limit, PER_PAGE) if limit else PER_PAGE
+    session = await get_session()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+    # refresh=True sends the cached ETag; a 304 Not Modified is served from
+    # the cache and doesn't count against the rate limit
+    request_options = (
+        {"refresh": True}
+        if isinstance(session, aiohttp_client_cache.CachedSession)
+        else {}
+    )
 
-            try:
-                async with session.get(url, headers=headers, params=params) as response:
-                    response.raise_for_status()
-                    batch = await response.json()
+    date_param = None
+    if created_after and created_before:
+        date_param = f"{created_after}..{created_before}"
+    elif created_after:
+        date_param = f">={created_after}"
+    elif created_before:
+        date_param = f"<={created_before}"
+
+    base_params = {"state": status, "per_page": per_page}
+    if date_param:
+        base_params["created"] = date_param
+
+    async def fetch_page(page: int):
+        params = {**base_params, "page": page}
+        async with semaphore:
+            attempt = 0
+            while True:
+                async with session.get(
+                    url, headers=headers, params=params, **request_options
+                ) as response:
+                    delay = retry_delay(response.status, response.headers, attempt)
+                    if delay is None:
+                        response.raise_for_status()
+                        batch = json_loads(await response.read())
+                        return [slim_pull(pr) for pr in batch], response.headers.get("Link")
+                # Sleep after the response is released so its connection is reused
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True,
+        disable=not show_progress,
+    ) as progress:
+        task = progress.add_task(description="Fetching pull requests...", total=None)
+
+        try:
+            # The first page tells us how many pages there are, the rest
+            # can then be requested concurrently.
+            first_batch, link_header = await fetch_page(1)
+
+            last_page = parse_last_page(link_header)
+            if limit:
+                last_page = min(last_page, math.ceil(limit / per_page))
+
+            batches = []
+            if len(first_batch) == per_page and last_page > 1:
+                pages_done = 1
+
+                async def fetch_and_report(page: int):
+                    nonlocal pages_done
+                    result = await fetch_page(page)
+                    pages_done += 1
+                    progress.update(
+                        task,
+                        description=f"Fetched {pages_done} of {last_page} pages...",
+                    )
+                    return result
+
+                progress.update(task, description=f"Fetched 1 of {last_page} pages...")
+                tasks = [
+                    asyncio.create_task(fetch_and_report(page))
+                    for page in range(2, last_page + 1)
+                ]
+                try:
+                    results = await asyncio.gather(*tasks)
+                finally:
+                    # One failed page fails the whole fetch, so stop the
+                    # others instead of leaving them retrying in the background
+                    for page_task in tasks:
+                        page_task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                batches = [batch for batch, _ in results]
+
+            pulls = []
+            for batch in (first_batch, *batches):
                 if not batch:
                     break
-
-                pulls.extend(batch)
-                if limit and len(pulls) >= limit:
-                    pulls = pulls[:limit]
-                    break
-
-                if len(batch) < 100:
+                if limit:
+                    # Only copy what still fits instead of trimming afterwards
+                    remaining = limit - len(pulls)
+                    pulls.extend(batch[:remaining])
+                    if len(pulls) >= limit:
+                        break
+                else:
+                    pulls.extend(batch)
+                # A short page is the last one, even if later pages were requested
+                if len(batch) < per_page:
                     break
 
-                page += 1
+        except aiohttp.ClientResponseError as e:
+            if e.status == 401:
+                _console().print("[red]Error: Invalid GitHub token[/red]")
+            elif e.status == 403:
+                _console().print("[red]Error: API rate limit exceeded[/red]")
+            elif e.status == 404:
+                _console().print(f"[red]Error: Repository {repository} not found[/red]")
+            else:
+                _console().print(f"[red]Error: {str(e)}[/red]")
+            sys.exit(1)
+        except aiohttp.ClientError as e:
+            _console().print(f"[red]Error: {str(e)}[/red]")
+            sys.exit(1)
 
-            except requests.exceptions.RequestException as e:
-                if response.status_code == 401:
-                    console.print("[red]Error: Invalid GitHub token[/red]")
-                elif response.status_code == 403:
-                    console.print("[red]Error: API rate limit exceeded[/red]")
-                elif response.status_code == 404:
-                    console.print("[red]Error: Repository not found[/red]")
-                else:
-                    console.print(f"[red]Error: {str(e)}[/red]")
-                sys.exit(1)
+    return pulls
 
-        return pulls
-    finally:
-        await session.close()
 
+def display_results(pulls: list, show_repository: bool = False) -> None:
+    """Display pull requests with enhanced statistics and formatting.
 
-def display_results(pulls: list) -> None:
-    """Display pull requests with enhanced statistics and formatting."""
-    # Calculate statistics
+    With ``show_repository``, the table gets a leading Repository column
+    taken from each pull request's ``repository`` key.
+    """
+    from rich.box import ROUNDED
+    from rich.columns import Columns
+    from rich.panel import Panel
+    from rich.table import Table
+    from rich.text import Text
+
+    # Calculate statistics in a single pass
+    open_prs = closed_prs = 0
+    oldest = "9999"
+    newest = ""
+    for pr in pulls:
+        state = pr["state"]
+        created = pr["created_at"]
+        open_prs += state == "open"
+        closed_prs += state == "closed"
+        if created < oldest:
+            oldest = created
+        if created > newest:
+            newest = created
     total_prs = len(pulls)
-    open_prs = len([pr for pr in pulls if pr["state"] == "open"])
-    closed_prs = len([pr for pr in pulls if pr["state"] == "closed"])
-    oldest_pr = min(pulls, key=lambda x: x["created_at"])["created_at"].split("T")[0]
-    newest_pr = max(pulls, key=lambda x: x["created_at"])["created_at"].split("T")[0]
+    oldest_pr = oldest[:ISO_DATE_LEN] if pulls else "N/A"
+    newest_pr = newest[:ISO_DATE_LEN] if pulls else "N/A"
     
     # Create statistics panel
     stats_panel = Panel(
@@ -172,6 +391,8 @@ def display_results(pulls: list) -> None:
     
     # Create PR table
     table = Table(show_header=True, header_style="bold", box=ROUNDED)
+    if show_repository:
+        table.add_column("Repository", style="blue")
     table.add_column("Number", justify="right")
     table.add_column("Title", style="cyan")
     table.add_column("Author", style="magenta")
@@ -179,114 +400,174 @@ def display_results(pulls: list) -> None:
     table.add_column("Created", justify="right")
     table.add_column("Updated", justify="right")
 
+    open_cell = "[green]open[/green]"
+    closed_cell = "[red]closed[/red]"
+    add_row = table.add_row
     for pr in pulls:
-        status_style = "green" if pr["state"] == "open" else "red"
-        table.add_row(
+        add_row(
+            *((pr["repository"],) if show_repository else ()),
             str(pr["number"]),
             pr["title"],
             pr["user"]["login"],
-            f"[{status_style}]{pr['state']}[/{status_style}]",
-            pr["created_at"].split("T")[0],
-            pr["updated_at"].split("T")[0],
+            open_cell if pr["state"] == "open" else closed_cell,
+            pr["created_at"][:ISO_DATE_LEN],
+            pr["updated_at"][:ISO_DATE_LEN],
         )
 
     # Display results
-    console.print(stats_panel)
-    console.print("\n")
-    console.print(table)
+    _console().print(stats_panel)
+    _console().print("\n")
+    _console().print(table)
 
 
-def export_to_csv(pulls: list, file_path: str) -> None:
+def export_to_csv(pulls: list, file_path: str, show_repository: bool = False) -> None:
     """Export pull requests to CSV file."""
     import csv
-    
-    with open(file_path, "w", newline="") as csvfile:
-        fieldnames = ["number", "title", "author", "status", "created", "updated"]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
+
+    fieldnames = ["number", "title", "author", "status", "created", "updated"]
+    if show_repository:
+        fieldnames.insert(0, "repository")
+    with open(file_path, "w", newline="", buffering=1 << 20) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            (
+                *((pr["repository"],) if show_repository else ()),
+                pr["number"],
+                pr["title"],
+                pr["user"]["login"],
+                pr["state"],
+                pr["created_at"][:ISO_DATE_LEN],
+                pr["updated_at"][:ISO_DATE_LEN],
+            )
+            for pr in pulls
+        )
+
+def export_to_json(pulls: list, file_path: str, show_repository: bool = False) -> None:
+    """Export pull requests to JSON file."""
+    # Write one object per line as we go rather than building the whole
+    # list first
+    with open(file_path, "wb") as jsonfile:
+        jsonfile.write(b"[\n")
+        separator = b""
         for pr in pulls:
-            writer.writerow({
+            jsonfile.write(separator)
+            jsonfile.write(json_dumps({
+                **({"repository": pr["repository"]} if show_repository else {}),
                 "number": pr["number"],
                 "title": pr["title"],
                 "author": pr["user"]["login"],
                 "status": pr["state"],
-                "created": pr["created_at"].split("T")[0],
-                "updated": pr["updated_at"].split("T")[0]
-            })
-
-def export_to_json(pulls: list, file_path: str) -> None:
-    """Export pull requests to JSON file."""
-    import json
-    
-    data = [{
-        "number": pr["number"],
-        "title": pr["title"],
-        "author": pr["user"]["login"],
-        "status": pr["state"],
-        "created": pr["created_at"].split("T")[0],
-        "updated": pr["updated_at"].split("T")[0]
-    } for pr in pulls]
-    
-    with open(file_path, "w") as jsonfile:
-        json.dump(data, jsonfile, indent=2)
+                "created": pr["created_at"][:ISO_DATE_LEN],
+                "updated": pr["updated_at"][:ISO_DATE_LEN]
+            }))
+            separator = b",\n"
+        jsonfile.write(b"\n]\n")
 
 async def main():
-    parser = argparse.ArgumentParser(description="Fetch GitHub Pull Requests for a specified repository.")
-    parser.add_argument("repository", help="Repository in format owner/repo")
+    parser = argparse.ArgumentParser(description="Fetch GitHub Pull Requests for one or more repositories.")
+    parser.add_argument("repository", nargs="+", help="Repositories in format owner/repo")
     parser.add_argument("--status", default="open", help="PR status: open, closed, or all")
-    parser.add_argument("--limit", type=int, help="Limit number of results")
+    parser.add_argument("--limit", type=int, help="Limit number of results per repository")
     parser.add_argument("--created-after", help="Only include PRs created after this date (YYYY-MM-DD)")
     parser.add_argument("--created-before", help="Only include PRs created before this date (YYYY-MM-DD)")
     parser.add_argument("--export-format", choices=["csv", "json"], help="Export format: csv or json")
     parser.add_argument("--output-file", help="Output file path for export")
+    parser.add_argument(
+        "--cache",
+        choices=CACHE_BACKENDS,
+        default=DEFAULT_CACHE_BACKEND,
+        help="Response cache: memory (default), sqlite (persisted between runs) or none",
+    )
     
     args = parser.parse_args()
     """
-    Fetch GitHub Pull Requests for a specified repository.
+    Fetch GitHub Pull Requests for one or more repositories.
     """
     # Load environment variables
+    from dotenv import load_dotenv
+
     load_dotenv()
 
     # Validate inputs
-    if not validate_repository(args.repository):
+    repositories = list(dict.fromkeys(args.repository))
+    # Check every argument so each bad one is reported, not just the first
+    if not all([validate_repository(repository) for repository in repositories]):
         sys.exit(1)
 
     if args.status not in ["open", "closed", "all"]:
-        console.print(
+        _console().print(
             "[red]Error: Invalid status. Use 'open', 'closed', or 'all'[/red]"
         )
         sys.exit(1)
 
     token = validate_token()
 
-    # Fetch results
-    pulls = await fetch_pull_requests(
-        args.repository, 
-        args.status, 
-        token, 
-        args.limit, 
-        args.created_after, 
-        args.created_before
-    )
+    # Fetch results, several repositories at a time
+    show_repository = len(repositories) > 1
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REPOS)
+
+    async def fetch_repository(repository: str) -> Optional[list]:
+        async with semaphore:
+            try:
+                repo_pulls = await fetch_pull_requests(
+                    repository,
+                    args.status,
+                    token,
+                    args.limit,
+                    args.created_after,
+                    args.created_before,
+                    show_progress=not show_repository,
+                )
+            except SystemExit:
+                # The error is already printed. SystemExit raised inside a
+                # gathered task escapes the event loop, so report the failure
+                # and exit once every fetch has finished.
+                return None
+        if show_repository:
+            for pr in repo_pulls:
+                pr["repository"] = repository
+        return repo_pulls
+
+    try:
+        await get_session(args.cache)
+        if show_repository:
+            with _console().status(
+                f"Fetching pull requests for {len(repositories)} repositories..."
+            ):
+                results = await asyncio.gather(
+                    *(fetch_repository(repository) for repository in repositories)
+                )
+        else:
+            results = [await fetch_repository(repositories[0])]
+    finally:
+        await close_session()
+    if any(repo_pulls is None for repo_pulls in results):
+        sys.exit(1)
+    pulls = [pr for repo_pulls in results for pr in repo_pulls]
     
     # Handle export if requested
     if args.export_format and args.output_file:
         if args.export_format == "csv":
-            export_to_csv(pulls, args.output_file)
-            console.print(f"[green]Exported results to {args.output_file} (CSV)[/green]")
+            export_to_csv(pulls, args.output_file, show_repository)
+            _console().print(f"[green]Exported results to {args.output_file} (CSV)[/green]")
         elif args.export_format == "json":
-            export_to_json(pulls, args.output_file)
-            console.print(f"[green]Exported results to {args.output_file} (JSON)[/green]")
+            export_to_json(pulls, args.output_file, show_repository)
+            _console().print(f"[green]Exported results to {args.output_file} (JSON)[/green]")
         else:
-            console.print("[red]Error: Invalid export format. Use 'csv' or 'json'[/red]")
+            _console().print("[red]Error: Invalid export format. Use 'csv' or 'json'[/red]")
             sys.exit(1)
     
     # Display results if no export requested
     if not args.export_format or not args.output_file:
-        display_results(pulls)
+        display_results(pulls, show_repository)
 
 
 if __name__ == "__main__":
-    import asyncio
+    # uvloop is optional and POSIX-only; fall back to the default loop
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     asyncio.run(main())
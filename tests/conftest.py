@@ -0,0 +1,44 @@
+"""Shared builders for the test modules."""
+from unittest.mock import MagicMock
+
+PULLS_URL = "https://api.github.com/repos/owner/repo/pulls"
+
+
+def make_pr(number, **fields):
+    """Build a pull request as the GitHub API returns it, with ``fields`` overriding"""
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "user": {"login": "octocat"},
+        "state": "open",
+        "created_at": "2023-01-01T10:00:00Z",
+        "updated_at": "2023-01-02T11:00:00Z",
+        **fields,
+    }
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response used as a context manager"""
+
+    def __init__(self, status, body=b"[]", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.released = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.released = True
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            import aiohttp
+
+            raise aiohttp.ClientResponseError(
+                MagicMock(real_url=PULLS_URL), (), status=self.status, message="error"
+            )
+
+    async def read(self):
+        return self.body
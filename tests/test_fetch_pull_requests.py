@@ -0,0 +1,269 @@
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from conftest import PULLS_URL, FakeResponse, make_pr
+from github_pr import fetch_pull_requests
+
+
+class FakeSession:
+    """Serves pages of pull requests, with a rel="last" Link header"""
+
+    url = PULLS_URL
+
+    def __init__(self, total, last_page=None, page_sizes=None):
+        self.total = total
+        self.last_page = last_page
+        self.page_sizes = page_sizes or {}
+        self.requests = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        import json
+
+        self.requests.append(params)
+        page, per_page = params["page"], params["per_page"]
+        last_page = self.last_page or max(1, -(-self.total // per_page))
+        start = (page - 1) * per_page
+        size = self.page_sizes.get(page, per_page)
+        numbers = range(start, min(start + size, self.total))
+        headers = {}
+        if last_page > 1:
+            headers["Link"] = f'<{self.url}?page={last_page}>; rel="last"'
+        return FakeResponse(
+            200, json.dumps([make_pr(n) for n in numbers]).encode(), headers
+        )
+
+    @property
+    def pages(self):
+        return [params["page"] for params in self.requests]
+
+
+def fetch(session, **kwargs):
+    with patch("github_pr.session", session):
+        return asyncio.run(
+            fetch_pull_requests("owner/repo", "open", "test-token", **kwargs)
+        )
+
+
+def test_fetches_remaining_pages_in_order():
+    """Test that pages 2..last are requested and kept in page order"""
+    session = FakeSession(total=350)
+    pulls = fetch(session)
+
+    assert sorted(session.pages) == [1, 2, 3, 4]
+    assert session.pages[0] == 1
+    assert [pr["number"] for pr in pulls] == list(range(350))
+
+
+def test_single_page_skips_gather():
+    """Test that a short first page doesn't request any more pages"""
+    session = FakeSession(total=40)
+    pulls = fetch(session)
+
+    assert session.pages == [1]
+    assert len(pulls) == 40
+
+
+def test_short_page_stops_collection():
+    """Test that pages after a short page are dropped"""
+    session = FakeSession(total=500, last_page=5, page_sizes={3: 20})
+    pulls = fetch(session)
+
+    assert sorted(session.pages) == [1, 2, 3, 4, 5]
+    assert [pr["number"] for pr in pulls] == list(range(220))
+
+
+def test_empty_page_stops_collection():
+    """Test that an empty page ends collection"""
+    session = FakeSession(total=200, last_page=4)
+    pulls = fetch(session)
+
+    assert sorted(session.pages) == [1, 2, 3, 4]
+    assert [pr["number"] for pr in pulls] == list(range(200))
+
+
+def test_limit_caps_pages_requested():
+    """Test that a limit of 150 requests exactly two full pages"""
+    session = FakeSession(total=500)
+    pulls = fetch(session, limit=150)
+
+    assert sorted(session.pages) == [1, 2]
+    assert [params["per_page"] for params in session.requests] == [100, 100]
+    assert [pr["number"] for pr in pulls] == list(range(150))
+
+
+def test_small_limit_shrinks_page_size():
+    """Test that a limit below a page requests only that many rows"""
+    session = FakeSession(total=500)
+    pulls = fetch(session, limit=5)
+
+    assert session.requests == [{"state": "open", "per_page": 5, "page": 1}]
+    assert [pr["number"] for pr in pulls] == list(range(5))
+
+
+class ScriptedSession:
+    """Returns the given responses in order, one per request"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        self.sent.append(response)
+        return response
+
+
+def test_retries_server_error_then_succeeds():
+    """Test that a 5xx is released, slept on and retried"""
+    import json
+
+    session = ScriptedSession([
+        FakeResponse(502),
+        FakeResponse(200, json.dumps([make_pr(1)]).encode()),
+    ])
+    released_before_sleep = []
+
+    async def fake_sleep(delay):
+        released_before_sleep.append((delay, session.sent[-1].released))
+
+    with patch("github_pr.asyncio.sleep", fake_sleep):
+        pulls = fetch(session)
+
+    assert [pr["number"] for pr in pulls] == [1]
+    assert released_before_sleep == [(1, True)]
+
+
+def test_gives_up_after_max_retries(capsys):
+    """Test that repeated 5xx responses stop after MAX_RETRIES and exit"""
+    from github_pr import MAX_RETRIES
+
+    session = ScriptedSession([FakeResponse(503) for _ in range(MAX_RETRIES + 1)])
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    with patch("github_pr.asyncio.sleep", fake_sleep):
+        with pytest.raises(SystemExit) as excinfo:
+            fetch(session)
+
+    assert excinfo.value.code == 1
+    assert len(session.sent) == MAX_RETRIES + 1
+    assert delays == [2 ** attempt for attempt in range(MAX_RETRIES)]
+
+
+def test_not_found_exits_with_repository_message(capsys):
+    """Test that a 404 prints the repository and exits with status 1"""
+    session = ScriptedSession([FakeResponse(404)])
+
+    with pytest.raises(SystemExit) as excinfo:
+        fetch(session)
+
+    assert excinfo.value.code == 1
+    assert "Repository owner/repo not found" in capsys.readouterr().out
+
+
+def test_connection_error_exits(capsys):
+    """Test that other aiohttp client errors exit with status 1"""
+    import aiohttp
+
+    session = ScriptedSession([aiohttp.ClientConnectionError("connection refused")])
+
+    with pytest.raises(SystemExit) as excinfo:
+        fetch(session)
+
+    assert excinfo.value.code == 1
+    assert "connection refused" in capsys.readouterr().out
+
+
+def test_failed_page_cancels_remaining_pages():
+    """Test that no page is requested again once another page has failed"""
+    import json
+
+    real_sleep = asyncio.sleep
+    requested = []
+
+    class FailingSession:
+        def get(self, url, headers=None, params=None, **kwargs):
+            page = params["page"]
+            requested.append(page)
+            if page == 1:
+                link = f'<{PULLS_URL}?page=6>; rel="last"'
+                body = json.dumps([make_pr(n) for n in range(100)]).encode()
+                return FakeResponse(200, body, {"Link": link})
+            if page == 2:
+                return FakeResponse(404)
+            return FakeResponse(502)
+
+    async def fake_sleep(delay):
+        await real_sleep(delay / 100)
+
+    async def run():
+        with pytest.raises(SystemExit):
+            await fetch_pull_requests("owner/repo", "open", "test-token")
+        requested_at_exit = len(requested)
+        # Keep the loop running, as main() does while other repositories fetch
+        await real_sleep(0.1)
+        return requested_at_exit
+
+    with patch("github_pr.session", FailingSession()), patch(
+        "github_pr.asyncio.sleep", fake_sleep
+    ):
+        requested_at_exit = asyncio.run(run())
+
+    assert len(requested) == requested_at_exit
+    assert sorted(requested) == [1, 2, 3, 4, 5, 6]
+
+
+@pytest.mark.parametrize("cache_backend", ["memory", "sqlite"])
+def test_cached_pages_are_revalidated_with_etag(cache_backend, tmp_path, monkeypatch):
+    """Test that a second fetch sends If-None-Match and reuses the cached body on 304"""
+    import github_pr
+    from aiohttp import web
+
+    monkeypatch.chdir(tmp_path)
+    etag = '"pulls-v1"'
+    seen = []
+
+    async def pulls_handler(request):
+        if_none_match = request.headers.get("If-None-Match")
+        seen.append(if_none_match)
+        if if_none_match == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.json_response([make_pr(1), make_pr(2)], headers={"ETag": etag})
+
+    async def run_twice():
+        app = web.Application()
+        app.router.add_get("/repos/{owner}/{repo}/pulls", pulls_handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        monkeypatch.setenv("GITHUB_API_URL", f"http://127.0.0.1:{port}")
+        try:
+            results = []
+            for _ in range(2):
+                await github_pr.get_session(cache_backend)
+                results.append(
+                    await github_pr.fetch_pull_requests("owner/repo", "open", "test-token")
+                )
+                # The SQLite cache must survive a new session, like a new run
+                if cache_backend == "sqlite":
+                    await github_pr.close_session()
+            return results
+        finally:
+            await github_pr.close_session()
+            await runner.cleanup()
+
+    first, second = asyncio.run(run_twice())
+    assert seen == [None, etag]
+    assert [pr["number"] for pr in first] == [1, 2]
+    assert second == first
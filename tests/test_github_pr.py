@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import os
 import sys
@@ -6,7 +7,13 @@ from unittest.mock import patch
 
 # Add project root to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from github_pr import validate_repository, validate_token
+from conftest import make_pr
+from github_pr import (
+    parse_last_page,
+    retry_delay,
+    validate_repository,
+    validate_token,
+)
 
 
 @pytest.mark.parametrize(
@@ -28,6 +35,52 @@ def test_validate_repository(repo, expected):
     assert validate_repository(repo) == expected
 
 
+@pytest.mark.parametrize(
+    "link_header,expected",
+    [
+        (None, 1),
+        ("", 1),
+        (
+            '<https://api.github.com/repositories/1/pulls?page=2>; rel="next", '
+            '<https://api.github.com/repositories/1/pulls?page=7>; rel="last"',
+            7,
+        ),
+        (
+            '<https://api.github.com/repositories/1/pulls?state=all&page=12>; rel="last"',
+            12,
+        ),
+        ('<https://api.github.com/repositories/1/pulls?page=1>; rel="prev"', 1),
+    ],
+)
+def test_parse_last_page(link_header, expected):
+    assert parse_last_page(link_header) == expected
+
+
+@pytest.mark.parametrize(
+    "status,headers,attempt,expected",
+    [
+        (200, {}, 0, None),
+        (404, {}, 0, None),
+        (502, {}, 0, 1),
+        (503, {}, 2, 4),
+        (503, {}, 3, None),
+        (403, {}, 0, None),
+        (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}, 0, 0),
+    ],
+)
+def test_retry_delay(status, headers, attempt, expected):
+    assert retry_delay(status, headers, attempt) == expected
+
+
+@patch("github_pr.time.time", return_value=1000)
+def test_retry_delay_waits_for_rate_limit_reset(mock_time):
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"}
+    assert retry_delay(403, headers, 0) == 30
+
+    headers["X-RateLimit-Reset"] = "5000"
+    assert retry_delay(403, headers, 0) is None
+
+
 @patch.dict(os.environ, {}, clear=True)
 def test_validate_token_missing():
     with pytest.raises(SystemExit):
@@ -41,7 +94,264 @@ def test_validate_token_present():
 
 def test_cache_initialization():
     """Test that the cache is properly initialized"""
-    from github_pr import session
-    from requests_cache import CachedSession
+    import github_pr
+    from aiohttp_client_cache import CachedSession
+
+    async def get_twice():
+        try:
+            return await github_pr.get_session(), await github_pr.get_session()
+        finally:
+            await github_pr.close_session()
+
+    first, second = asyncio.run(get_twice())
+    assert isinstance(first, CachedSession)
+    assert first is second
+    assert github_pr.session is None
+
+
+@pytest.mark.parametrize("cache_backend", ["memory", "sqlite", "none"])
+def test_create_session_cache_backends(cache_backend, tmp_path, monkeypatch):
+    """Test that each --cache choice builds the matching session"""
+    import github_pr
+    from aiohttp import ClientSession
+    from aiohttp_client_cache import CachedSession
+    from github_cache import ExpiringSQLiteBackend
+
+    monkeypatch.chdir(tmp_path)
+
+    async def create():
+        session = await github_pr.create_session(cache_backend)
+        await session.close()
+        return session
+
+    session = asyncio.run(create())
+    assert isinstance(session, ClientSession)
+    assert isinstance(session, CachedSession) == (cache_backend != "none")
+    if cache_backend != "none":
+        assert isinstance(session.cache, ExpiringSQLiteBackend) == (
+            cache_backend == "sqlite"
+        )
+
+
+def test_expiring_cache_purges_expired_rows(tmp_path):
+    """Test that expired rows are deleted when the cache is opened"""
+    import sqlite3
+    from github_cache import ExpiringSQLiteCache
+
+    db_path = str(tmp_path / "cache.sqlite")
+
+    async def write_rows():
+        cache = ExpiringSQLiteCache(db_path, "responses")
+        await cache.write("fresh", "value")
+        await cache.close()
+
+    asyncio.run(write_rows())
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO responses (key, value, expires_at) VALUES ('stale', 'x', 0)"
+        )
+
+    async def reopen():
+        cache = ExpiringSQLiteCache(db_path, "responses")
+        try:
+            return [key async for key in cache.keys()]
+        finally:
+            await cache.close()
+
+    assert asyncio.run(reopen()) == ["fresh"]
+
+
+def test_expiring_backend_deletes_expired_responses_and_redirects(tmp_path):
+    """Test that delete_expired_responses drops expired rows and their redirects"""
+    from types import SimpleNamespace
+    from github_cache import ExpiringSQLiteBackend
+
+    db_path = str(tmp_path / "cache.sqlite")
+    # Pickleable stand-ins for a CachedResponse and the redirect it followed
+    redirected = SimpleNamespace(method="GET", url="https://example.com/old")
+    response = SimpleNamespace(history=(redirected,), is_expired=True)
+
+    async def purge(**kwargs):
+        backend = ExpiringSQLiteBackend(db_path, **kwargs)
+        try:
+            await backend.responses.write(
+                "fresh", SimpleNamespace(history=(), is_expired=False)
+            )
+            await backend.responses.write("stale", response)
+            await backend.redirects.write(
+                backend.create_key("GET", redirected.url), "stale"
+            )
+            async with backend.responses.get_connection(commit=True) as db:
+                await db.execute(
+                    "UPDATE responses SET expires_at = 0 WHERE key = 'stale'"
+                )
+            await backend.delete_expired_responses()
+            return (
+                [key async for key in backend.responses.keys()],
+                [key async for key in backend.redirects.keys()],
+            )
+        finally:
+            await backend.close()
+
+    assert asyncio.run(purge()) == (["fresh"], [])
+    # A filter_fn still applies to the rows that haven't expired
+    assert asyncio.run(purge(filter_fn=lambda response: False)) == ([], [])
+
+
+def test_export_to_json(tmp_path):
+    """Test that the streamed JSON export is a valid JSON array"""
+    import json
+    from github_pr import export_to_json
+
+    pulls = [make_pr(number) for number in (1, 2)]
+    file_path = tmp_path / "pulls.json"
+    export_to_json(pulls, str(file_path))
+
+    data = json.loads(file_path.read_text())
+    assert [pr["number"] for pr in data] == [1, 2]
+    assert data[0] == {
+        "number": 1,
+        "title": "PR 1",
+        "author": "octocat",
+        "status": "open",
+        "created": "2023-01-01",
+        "updated": "2023-01-02",
+    }
+
+    export_to_json([], str(file_path))
+    assert json.loads(file_path.read_text()) == []
+
+
+def test_export_to_csv_with_repository(tmp_path):
+    """Test that multi-repository exports lead with a repository column"""
+    import csv
+    from github_pr import export_to_csv
+
+    pulls = [
+        make_pr(1, state="closed", repository=repository)
+        for repository in ("owner/one", "owner/two")
+    ]
+    file_path = tmp_path / "pulls.csv"
+    export_to_csv(pulls, str(file_path), show_repository=True)
+
+    with open(file_path, newline="") as csvfile:
+        rows = list(csv.reader(csvfile))
+    assert rows[0] == [
+        "repository", "number", "title", "author", "status", "created", "updated"
+    ]
+    assert rows[1] == [
+        "owner/one", "1", "PR 1", "octocat", "closed", "2023-01-01", "2023-01-02"
+    ]
+    assert rows[2][0] == "owner/two"
+
+
+def run_main(argv, fake_fetch):
+    """Run github_pr.main() with the given arguments and a fake fetch"""
+    import github_pr
+
+    with patch.object(sys, "argv", ["github_pr.py", *argv]), patch.dict(
+        os.environ, {"GITHUB_TOKEN": "test-token"}
+    ), patch("github_pr.fetch_pull_requests", fake_fetch), patch(
+        "github_pr.display_results"
+    ) as mock_display:
+        asyncio.run(github_pr.main())
+    return mock_display
+
+
+def test_main_tags_pulls_and_drops_duplicate_repositories():
+    """Test that several repositories are fetched once each and tagged"""
+    fetched = []
+
+    async def fake_fetch(repository, *args, show_progress=True):
+        fetched.append((repository, show_progress))
+        return [make_pr(1), make_pr(2)]
+
+    mock_display = run_main(["owner/one", "owner/two", "owner/one"], fake_fetch)
+
+    assert sorted(fetched) == [("owner/one", False), ("owner/two", False)]
+    pulls, show_repository = mock_display.call_args[0]
+    assert show_repository is True
+    assert [(pr["repository"], pr["number"]) for pr in pulls] == [
+        ("owner/one", 1),
+        ("owner/one", 2),
+        ("owner/two", 1),
+        ("owner/two", 2),
+    ]
+
+
+def test_main_single_repository_is_untagged():
+    """Test that a single repository keeps its spinner and has no Repository column"""
+    async def fake_fetch(repository, *args, show_progress=True):
+        assert show_progress is True
+        return [make_pr(1)]
+
+    mock_display = run_main(["owner/one"], fake_fetch)
+
+    pulls, show_repository = mock_display.call_args[0]
+    assert show_repository is False
+    assert "repository" not in pulls[0]
+
+
+def test_main_failing_repository_exits_after_others_finish():
+    """Test that one failing repository exits 1 once the others are done"""
+    finished = []
+
+    async def fake_fetch(repository, *args, show_progress=True):
+        if repository == "owner/bad":
+            sys.exit(1)
+        await asyncio.sleep(0.01)
+        finished.append(repository)
+        return [make_pr(1)]
+
+    with pytest.raises(SystemExit) as excinfo:
+        run_main(["owner/bad", "owner/one", "owner/two"], fake_fetch)
+
+    assert excinfo.value.code == 1
+    assert sorted(finished) == ["owner/one", "owner/two"]
+
+
+def test_display_results_with_repository(capsys):
+    """Test that the table gets a Repository column"""
+    from github_pr import display_results
+
+    pulls = [
+        make_pr(1, repository="owner/one"),
+        make_pr(2, state="closed", repository="owner/two"),
+    ]
+    display_results(pulls, show_repository=True)
+
+    out = capsys.readouterr().out
+    assert "Repository" in out
+    assert "owner/one" in out and "owner/two" in out
+    assert "Total PRs: 2" in out
+
+
+def test_export_to_json_with_repository(tmp_path):
+    """Test that multi-repository JSON exports lead with a repository field"""
+    import json
+    from github_pr import export_to_json
+
+    pulls = [make_pr(1, repository="owner/one")]
+    file_path = tmp_path / "pulls.json"
+    export_to_json(pulls, str(file_path), show_repository=True)
+
+    data = json.loads(file_path.read_text())
+    assert list(data[0]) == [
+        "repository", "number", "title", "author", "status", "created", "updated"
+    ]
+    assert data[0]["repository"] == "owner/one"
+
+
+def test_main_names_each_invalid_repository(capsys):
+    """Test that every malformed repository argument is named in the error"""
+    async def fake_fetch(repository, *args, show_progress=True):
+        raise AssertionError("nothing should be fetched")
+
+    with pytest.raises(SystemExit) as excinfo:
+        run_main(["owner/one", "bad", "owner/two/extra"], fake_fetch)
 
-    assert isinstance(session, CachedSession)
+    assert excinfo.value.code == 1
+    output = capsys.readouterr().out
+    assert "Invalid repository format: bad" in output
+    assert "Invalid repository format: owner/two/extra" in output
+    assert "owner/one" not in output